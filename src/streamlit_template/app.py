@@ -1,19 +1,73 @@
 """Visual Novel Script Creator - Main Streamlit application module."""
 
+import bisect
+import re
+
 import streamlit as st
 import pandas as pd
 from typing import Dict, List, Any
 import json
 
 from streamlit_template.utils import (
-    create_character, 
-    create_story_arc, 
+    create_character,
+    create_story_arc,
     create_milestone,
+    current_timestamp,
     generate_dialogue_options,
-    export_script_format
+    export_script_format,
+    summarize_project
 )
 
 
+# Keyword sets used for simple genre detection, keyed by genre name.
+GENRE_KEYWORDS = {
+    "Romance": frozenset({"love", "romance", "heart"}),
+    "Mystery": frozenset({"mystery", "detective", "crime"}),
+    "Fantasy": frozenset({"magic", "fantasy", "dragon"}),
+    "Slice of Life": frozenset({"school", "student", "class"}),
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+@st.cache_data(max_entries=64)
+def detect_genres(concept: str) -> List[str]:
+    """Detect likely genres from keywords in a story concept.
+
+    Args:
+        concept: Free-form story concept text
+
+    Returns:
+        List of detected genre names, in a stable order
+    """
+    words = frozenset(_WORD_RE.findall(concept.lower()))
+    return [genre for genre, keywords in GENRE_KEYWORDS.items() if words & keywords]
+
+
+@st.cache_data(hash_funcs={list: lambda items: (len(items), id(items))})
+def compute_summary(
+    characters: List[Dict[str, Any]],
+    story_arcs: List[Dict[str, Any]],
+    milestones: List[Dict[str, Any]],
+    dialogue_scenes: List[Dict[str, Any]]
+) -> Dict[str, int]:
+    """Cached wrapper around summarize_project for per-rerun reuse.
+
+    The session-state lists are hashed by (length, identity) so repeat
+    reruns without add/delete operations short-circuit the aggregation.
+
+    Args:
+        characters: Session-state list of character dictionaries
+        story_arcs: Session-state list of story arc dictionaries
+        milestones: Session-state list of milestone dictionaries
+        dialogue_scenes: Session-state list of dialogue scene dictionaries
+
+    Returns:
+        Dictionary of summary counts
+    """
+    return summarize_project(characters, story_arcs, milestones, dialogue_scenes)
+
+
 def initialize_session_state():
     """Initialize session state variables."""
     if 'characters' not in st.session_state:
@@ -38,6 +92,9 @@ def main() -> None:
 
     initialize_session_state()
 
+    # Refresh the per-rerun timestamp used for created_at fields
+    current_timestamp.cache_clear()
+
     st.title("📚 Visual Novel Script Creator")
     st.write("Transform your story ideas into structured visual novel scripts with characters, dialogue branches, and story arcs!")
 
@@ -66,6 +123,7 @@ def main() -> None:
         dialogue_and_export_section()
 
 
+@st.fragment
 def story_concept_section():
     """Handle the story concept input section."""
     st.header("Story Concept")
@@ -90,21 +148,14 @@ def story_concept_section():
             st.write("**Character Count:**", len(concept))
         
         with col2:
-            # Simple genre detection based on keywords
-            genres = []
-            if any(word in concept.lower() for word in ['love', 'romance', 'heart']):
-                genres.append("Romance")
-            if any(word in concept.lower() for word in ['mystery', 'detective', 'crime']):
-                genres.append("Mystery")
-            if any(word in concept.lower() for word in ['magic', 'fantasy', 'dragon']):
-                genres.append("Fantasy")
-            if any(word in concept.lower() for word in ['school', 'student', 'class']):
-                genres.append("Slice of Life")
-            
+            # Simple genre detection based on keywords (cached across reruns)
+            genres = detect_genres(concept)
+
             if genres:
                 st.write("**Detected Genres:**", ", ".join(genres))
 
 
+@st.fragment
 def characters_section():
     """Handle the character creation and management section."""
     st.header("Character Development")
@@ -131,35 +182,48 @@ def characters_section():
             
             if submitted and char_name:
                 character = create_character(
-                    char_name, char_role, char_age, 
-                    char_personality, char_background, char_goals
+                    char_name, char_role, char_age,
+                    char_personality, char_background, char_goals,
+                    created_at=current_timestamp()
                 )
                 st.session_state.characters.append(character)
                 st.success(f"Added character: {char_name}")
-                st.rerun()
+                st.rerun(scope="app")
 
-    # Display existing characters
-    if st.session_state.characters:
-        st.subheader("Your Characters")
-        
-        for i, char in enumerate(st.session_state.characters):
-            with st.expander(f"{char['name']} ({char['role']})"):
-                col1, col2, col3 = st.columns([2, 2, 1])
-                
-                with col1:
-                    st.write(f"**Age:** {char['age']}")
-                    st.write(f"**Personality:** {char['personality']}")
-                
-                with col2:
-                    st.write(f"**Background:** {char['background']}")
-                    st.write(f"**Goals:** {char['goals']}")
-                
-                with col3:
-                    if st.button(f"Delete", key=f"del_char_{i}"):
-                        st.session_state.characters.pop(i)
-                        st.rerun()
+    # Display existing characters in one table instead of N expanders
+    live_characters = [c for c in st.session_state.characters if not c.deleted]
 
+    # Compact the backing list once tombstones outnumber live records
+    if len(st.session_state.characters) > 2 * len(live_characters):
+        st.session_state.characters = live_characters
 
+    if live_characters:
+        st.subheader("Your Characters")
+
+        characters_df = pd.DataFrame(live_characters).drop(
+            columns=['id', 'created_at', 'deleted']
+        )
+        selection = st.dataframe(
+            characters_df,
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            key="characters_table"
+        )
+        # Selection state persists across data changes, so ignore rows
+        # that no longer exist in the current list
+        selected_rows = selection.selection.rows
+        if selected_rows and selected_rows[0] < len(live_characters):
+            if st.button("Delete Selected Character"):
+                # O(1) tombstone delete; compaction happens on later renders
+                live_characters[selected_rows[0]].deleted = True
+                compute_summary.clear()
+                # Drop the now-orphaned selection before the data shrinks
+                del st.session_state["characters_table"]
+                st.rerun(scope="app")
+
+
+@st.fragment
 def story_arcs_section():
     """Handle story arc creation and management."""
     st.header("Story Arcs")
@@ -179,8 +243,11 @@ def story_arcs_section():
                 arc_end = st.number_input("End Chapter", min_value=1, value=5)
                 
                 # Character involvement
-                if st.session_state.characters:
-                    char_names = [char['name'] for char in st.session_state.characters]
+                char_names = [
+                    char['name'] for char in st.session_state.characters
+                    if not char.deleted
+                ]
+                if char_names:
                     involved_chars = st.multiselect("Characters Involved", char_names)
                 else:
                     involved_chars = []
@@ -189,36 +256,43 @@ def story_arcs_section():
             
             if submitted and arc_name:
                 arc = create_story_arc(
-                    arc_name, arc_description, arc_start, arc_end, 
-                    arc_themes, involved_chars
+                    arc_name, arc_description, arc_start, arc_end,
+                    arc_themes, involved_chars,
+                    created_at=current_timestamp()
                 )
                 st.session_state.story_arcs.append(arc)
                 st.success(f"Created story arc: {arc_name}")
-                st.rerun()
+                st.rerun(scope="app")
 
-    # Display existing arcs
+    # Display existing arcs in one table instead of N expanders
     if st.session_state.story_arcs:
         st.subheader("Your Story Arcs")
-        
-        for i, arc in enumerate(st.session_state.story_arcs):
-            with st.expander(f"{arc['name']} (Ch. {arc['start_chapter']}-{arc['end_chapter']})"):
-                col1, col2, col3 = st.columns([2, 2, 1])
-                
-                with col1:
-                    st.write(f"**Description:** {arc['description']}")
-                    st.write(f"**Themes:** {arc['themes']}")
-                
-                with col2:
-                    if arc['characters']:
-                        st.write(f"**Characters:** {', '.join(arc['characters'])}")
-                    st.write(f"**Duration:** {arc['end_chapter'] - arc['start_chapter'] + 1} chapters")
-                
-                with col3:
-                    if st.button(f"Delete", key=f"del_arc_{i}"):
-                        st.session_state.story_arcs.pop(i)
-                        st.rerun()
-
 
+        arcs_df = pd.DataFrame(st.session_state.story_arcs).drop(
+            columns=['id', 'created_at']
+        )
+        selection = st.dataframe(
+            arcs_df,
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            key="arcs_table"
+        )
+        # Selection state persists across data changes, so ignore rows
+        # that no longer exist in the current list
+        selected_rows = selection.selection.rows
+        if selected_rows and selected_rows[0] < len(st.session_state.story_arcs):
+            if st.button("Delete Selected Arc"):
+                st.session_state.story_arcs.pop(selected_rows[0])
+                # The (length, identity) hash misses in-place edits that
+                # restore a previous length, so invalidate explicitly
+                compute_summary.clear()
+                # Drop the now-orphaned selection before the data shrinks
+                del st.session_state["arcs_table"]
+                st.rerun(scope="app")
+
+
+@st.fragment
 def milestones_section():
     """Handle milestone creation and management."""
     st.header("Story Milestones")
@@ -255,39 +329,49 @@ def milestones_section():
             if submitted and milestone_name:
                 milestone = create_milestone(
                     milestone_name, milestone_description, milestone_chapter,
-                    milestone_type, milestone_impact, related_arc if related_arc != "None" else None
+                    milestone_type, milestone_impact,
+                    related_arc if related_arc != "None" else None,
+                    created_at=current_timestamp()
+                )
+                # Keep the list sorted by chapter so renders skip sorting
+                bisect.insort(
+                    st.session_state.milestones, milestone,
+                    key=lambda m: m['chapter']
                 )
-                st.session_state.milestones.append(milestone)
                 st.success(f"Added milestone: {milestone_name}")
-                st.rerun()
+                st.rerun(scope="app")
 
-    # Display existing milestones
+    # Display existing milestones in one table instead of N expanders;
+    # the list is kept sorted by chapter at insert time
     if st.session_state.milestones:
         st.subheader("Your Milestones")
-        
-        # Sort milestones by chapter
-        sorted_milestones = sorted(st.session_state.milestones, key=lambda x: x['chapter'])
-        
-        for i, milestone in enumerate(sorted_milestones):
-            with st.expander(f"Ch. {milestone['chapter']}: {milestone['name']} [{milestone['impact']}]"):
-                col1, col2, col3 = st.columns([2, 2, 1])
-                
-                with col1:
-                    st.write(f"**Type:** {milestone['type']}")
-                    st.write(f"**Description:** {milestone['description']}")
-                
-                with col2:
-                    st.write(f"**Impact:** {milestone['impact']}")
-                    if milestone['related_arc']:
-                        st.write(f"**Related Arc:** {milestone['related_arc']}")
-                
-                with col3:
-                    milestone_idx = st.session_state.milestones.index(milestone)
-                    if st.button(f"Delete", key=f"del_milestone_{milestone_idx}"):
-                        st.session_state.milestones.pop(milestone_idx)
-                        st.rerun()
-
 
+        milestones_df = pd.DataFrame(st.session_state.milestones).drop(
+            columns=['id', 'created_at']
+        )
+        selection = st.dataframe(
+            milestones_df,
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            key="milestones_table"
+        )
+        # Selection state persists across data changes, so ignore rows
+        # that no longer exist in the current list
+        selected_rows = selection.selection.rows
+        if selected_rows and selected_rows[0] < len(st.session_state.milestones):
+            if st.button("Delete Selected Milestone"):
+                # Table rows align with list positions, so pop directly
+                st.session_state.milestones.pop(selected_rows[0])
+                # The (length, identity) hash misses in-place edits that
+                # restore a previous length, so invalidate explicitly
+                compute_summary.clear()
+                # Drop the now-orphaned selection before the data shrinks
+                del st.session_state["milestones_table"]
+                st.rerun(scope="app")
+
+
+@st.fragment
 def dialogue_and_export_section():
     """Handle dialogue creation and script export."""
     st.header("Dialogue Scenes & Export")
@@ -297,8 +381,11 @@ def dialogue_and_export_section():
         scene_name = st.text_input("Scene Name")
         scene_chapter = st.number_input("Chapter", min_value=1, value=1)
         
-        if st.session_state.characters:
-            char_names = [char['name'] for char in st.session_state.characters]
+        char_names = [
+            char['name'] for char in st.session_state.characters
+            if not char.deleted
+        ]
+        if char_names:
             scene_characters = st.multiselect("Characters in Scene", char_names)
             
             if scene_characters:
@@ -359,16 +446,22 @@ def dialogue_and_export_section():
 
         # Project summary
         st.subheader("Project Summary")
+        summary = compute_summary(
+            st.session_state.characters,
+            st.session_state.story_arcs,
+            st.session_state.milestones,
+            st.session_state.dialogue_scenes
+        )
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
-            st.metric("Characters", len(st.session_state.characters))
+            st.metric("Characters", summary['characters'])
         with col2:
-            st.metric("Story Arcs", len(st.session_state.story_arcs))
+            st.metric("Story Arcs", summary['story_arcs'])
         with col3:
-            st.metric("Milestones", len(st.session_state.milestones))
+            st.metric("Milestones", summary['milestones'])
         with col4:
-            st.metric("Dialogue Scenes", len(st.session_state.dialogue_scenes))
+            st.metric("Dialogue Scenes", summary['dialogue_scenes'])
 
     else:
         st.info("Create some characters, story arcs, or milestones to enable export functionality.")
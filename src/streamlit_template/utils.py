@@ -1,13 +1,36 @@
 """Utility functions for Visual Novel Script Creator and data processing."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Literal, Optional
+import csv
+import io
+import re
+import sys
+from collections import Counter
 import json
+import uuid
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+import streamlit as st
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+# Hash export payloads by their JSON content so unchanged projects hit
+# the cache. The payloads carry no export date; export_script_format adds
+# the fresh date outside the cached functions.
+_EXPORT_HASH_FUNCS = {
+    dict: lambda d: json.dumps(d, sort_keys=True, default=str)
+}
+
 
 # Original template functions (preserved)
+@st.cache_data
 def get_sample_data(rows: int = 10) -> pd.DataFrame:
     """Generate sample data for demonstration.
 
@@ -17,14 +40,14 @@ def get_sample_data(rows: int = 10) -> pd.DataFrame:
     Returns:
         DataFrame with sample data including random numbers and dates
     """
-    np.random.seed(42)  # For reproducibility
+    rng = np.random.default_rng(42)  # Local generator for reproducibility
 
     return pd.DataFrame(
         {
             "date": pd.date_range(start="2024-01-01", periods=rows),
-            "value_a": np.random.randn(rows),
-            "value_b": np.random.randn(rows),
-            "category": np.random.choice(["A", "B", "C"], size=rows),
+            "value_a": rng.standard_normal(rows),
+            "value_b": rng.standard_normal(rows),
+            "category": rng.choice(["A", "B", "C"], size=rows),
         }
     )
 
@@ -38,16 +61,15 @@ def process_data(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with additional computed columns
     """
-    # Create a copy to avoid modifying the input
-    processed = df.copy()
-
     # Add some computed columns if the required columns exist
-    if "value_a" in processed.columns and "value_b" in processed.columns:
-        processed["sum"] = processed["value_a"] + processed["value_b"]
-        processed["mean"] = (processed["value_a"] + processed["value_b"]) / 2
-        processed["abs_diff"] = abs(processed["value_a"] - processed["value_b"])
+    if "value_a" in df.columns and "value_b" in df.columns:
+        a = df["value_a"].to_numpy(copy=False)
+        b = df["value_b"].to_numpy(copy=False)
+        total = a + b
+        # assign returns a new frame, so the input stays unmodified
+        return df.assign(sum=total, mean=total * 0.5, abs_diff=np.abs(a - b))
 
-    return processed
+    return df.copy()
 
 
 def validate_dataframe(
@@ -75,16 +97,101 @@ def validate_dataframe(
 
 
 # Visual Novel Script Creator functions
+@lru_cache(maxsize=1)
+def current_timestamp() -> str:
+    """Return the current time as an ISO-8601 string, cached until cleared.
+
+    This is a helper for callers that create records in batches: the
+    Streamlit app clears the cache at the start of every rerun and passes
+    the value as created_at to the record factories, so records created
+    within one rerun share a single timestamp. Callers that do not manage
+    the cache with cache_clear() must not use this as a live clock; the
+    factories default to a fresh timestamp on their own.
+
+    Returns:
+        ISO formatted timestamp string
+    """
+    return datetime.now().isoformat()
+
+
+# Enum-like string fields, fixed by the selectbox choices in the app.
+# Values are interned at creation so comparisons against these literals
+# reduce to pointer checks in the analysis and validation loops.
+CharacterRole = Literal[
+    "Main Character", "Love Interest", "Rival", "Friend",
+    "Mentor", "Antagonist", "Supporting"
+]
+MilestoneType = Literal[
+    "Plot Point", "Character Development", "Relationship Change",
+    "World Building", "Conflict Resolution"
+]
+ImpactLevel = Literal["Low", "Medium", "High", "Critical"]
+
+
+class _Record:
+    """Dict-style subscript access shared by the slotted record classes."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+
+@dataclass(slots=True)
+class Character(_Record):
+    """A visual novel character."""
+
+    name: str
+    role: CharacterRole
+    age: int
+    personality: str
+    background: str
+    goals: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Tombstone flag: deletes mark the record and compaction happens later
+    deleted: bool = False
+
+
+@dataclass(slots=True)
+class StoryArc(_Record):
+    """A story arc spanning a range of chapters."""
+
+    name: str
+    description: str
+    start_chapter: int
+    end_chapter: int
+    themes: str
+    characters: List[str]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+@dataclass(slots=True)
+class Milestone(_Record):
+    """A story milestone tied to a chapter."""
+
+    name: str
+    description: str
+    chapter: int
+    type: MilestoneType
+    impact: ImpactLevel
+    related_arc: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
 def create_character(
     name: str,
-    role: str,
+    role: CharacterRole,
     age: int,
     personality: str,
     background: str,
-    goals: str
-) -> Dict[str, Any]:
-    """Create a character dictionary with all necessary information.
-    
+    goals: str,
+    created_at: Optional[str] = None
+) -> Character:
+    """Create a character record with all necessary information.
+
     Args:
         name: Character's name
         role: Character's role in the story
@@ -92,19 +199,20 @@ def create_character(
         personality: Personality traits description
         background: Character's background story
         goals: Character's goals and motivations
-        
+        created_at: Pre-formatted creation timestamp; defaults to now
+
     Returns:
-        Dictionary containing character information
+        Character record
     """
-    return {
-        'name': name,
-        'role': role,
-        'age': age,
-        'personality': personality,
-        'background': background,
-        'goals': goals,
-        'created_at': datetime.now().isoformat()
-    }
+    return Character(
+        name=name,
+        role=sys.intern(role),
+        age=age,
+        personality=personality,
+        background=background,
+        goals=goals,
+        created_at=created_at if created_at is not None else datetime.now().isoformat()
+    )
 
 
 def create_story_arc(
@@ -113,10 +221,11 @@ def create_story_arc(
     start_chapter: int,
     end_chapter: int,
     themes: str,
-    characters: List[str]
-) -> Dict[str, Any]:
-    """Create a story arc dictionary.
-    
+    characters: List[str],
+    created_at: Optional[str] = None
+) -> StoryArc:
+    """Create a story arc record.
+
     Args:
         name: Arc name
         description: Arc description
@@ -124,31 +233,33 @@ def create_story_arc(
         end_chapter: Ending chapter number
         themes: Main themes of the arc
         characters: List of character names involved
-        
+        created_at: Pre-formatted creation timestamp; defaults to now
+
     Returns:
-        Dictionary containing story arc information
+        StoryArc record
     """
-    return {
-        'name': name,
-        'description': description,
-        'start_chapter': start_chapter,
-        'end_chapter': end_chapter,
-        'themes': themes,
-        'characters': characters,
-        'created_at': datetime.now().isoformat()
-    }
+    return StoryArc(
+        name=name,
+        description=description,
+        start_chapter=start_chapter,
+        end_chapter=end_chapter,
+        themes=themes,
+        characters=characters,
+        created_at=created_at if created_at is not None else datetime.now().isoformat()
+    )
 
 
 def create_milestone(
     name: str,
     description: str,
     chapter: int,
-    milestone_type: str,
-    impact: str,
-    related_arc: Optional[str] = None
-) -> Dict[str, Any]:
-    """Create a story milestone dictionary.
-    
+    milestone_type: MilestoneType,
+    impact: ImpactLevel,
+    related_arc: Optional[str] = None,
+    created_at: Optional[str] = None
+) -> Milestone:
+    """Create a story milestone record.
+
     Args:
         name: Milestone name
         description: Milestone description
@@ -156,19 +267,30 @@ def create_milestone(
         milestone_type: Type of milestone
         impact: Impact level of the milestone
         related_arc: Related story arc (optional)
-        
+        created_at: Pre-formatted creation timestamp; defaults to now
+
     Returns:
-        Dictionary containing milestone information
+        Milestone record
     """
-    return {
-        'name': name,
-        'description': description,
-        'chapter': chapter,
-        'type': milestone_type,
-        'impact': impact,
-        'related_arc': related_arc,
-        'created_at': datetime.now().isoformat()
-    }
+    return Milestone(
+        name=name,
+        description=description,
+        chapter=chapter,
+        type=sys.intern(milestone_type),
+        impact=sys.intern(impact),
+        related_arc=related_arc,
+        created_at=created_at if created_at is not None else datetime.now().isoformat()
+    )
+
+
+# Personality traits that unlock an extra dialogue option, matched in one
+# case-insensitive scan of the traits string.
+_TRAIT_RE = re.compile(r'\b(confident|shy|aggressive)\b', re.IGNORECASE)
+_TRAIT_OPTIONS = {
+    'confident': "I know exactly what to do in this situation!",
+    'shy': "Um... maybe we should think about this more?",
+    'aggressive': "We need to take action now!"
+}
 
 
 def generate_dialogue_options(
@@ -195,239 +317,303 @@ def generate_dialogue_options(
     ]
     
     # Modify based on personality (simplified logic)
-    if 'confident' in personality_traits.lower():
-        base_options.append(f"I know exactly what to do in this situation!")
-    if 'shy' in personality_traits.lower():
-        base_options.append(f"Um... maybe we should think about this more?")
-    if 'aggressive' in personality_traits.lower():
-        base_options.append(f"We need to take action now!")
-    
+    found_traits = {match.lower() for match in _TRAIT_RE.findall(personality_traits)}
+    for trait, option in _TRAIT_OPTIONS.items():
+        if trait in found_traits:
+            base_options.append(option)
+
     return base_options[:4]  # Return up to 4 options
 
 
 def export_script_format(
     story_concept: str,
-    characters: List[Dict[str, Any]],
-    story_arcs: List[Dict[str, Any]],
-    milestones: List[Dict[str, Any]],
+    characters: List[Character],
+    story_arcs: List[StoryArc],
+    milestones: List[Milestone],
     dialogue_scenes: List[Dict[str, Any]],
     format_type: str
 ) -> str:
     """Export the visual novel script in specified format.
-    
+
     Args:
         story_concept: The main story concept
-        characters: List of character dictionaries
-        story_arcs: List of story arc dictionaries
-        milestones: List of milestone dictionaries
+        characters: List of character records
+        story_arcs: List of story arc records
+        milestones: List of milestone records
         dialogue_scenes: List of dialogue scene dictionaries
         format_type: Export format ("JSON", "Markdown", "CSV Summary")
-        
+
     Returns:
         Formatted export string
     """
-    export_data = {
+    # Records are converted to plain dicts only at this export boundary;
+    # tombstoned characters are compacted away here. The export date is
+    # kept out of this payload so the cached generators stay content-keyed.
+    content = {
         'story_concept': story_concept,
-        'characters': characters,
-        'story_arcs': story_arcs,
-        'milestones': milestones,
-        'dialogue_scenes': dialogue_scenes,
-        'export_date': datetime.now().isoformat()
+        'characters': [
+            {k: v for k, v in asdict(char).items() if k != 'deleted'}
+            for char in characters
+            if not char.deleted
+        ],
+        'story_arcs': [asdict(arc) for arc in story_arcs],
+        'milestones': [asdict(milestone) for milestone in milestones],
+        'dialogue_scenes': dialogue_scenes
     }
-    
-    if format_type == "JSON":
-        return json.dumps(export_data, indent=2)
-    
-    elif format_type == "Markdown":
-        return generate_markdown_export(export_data)
-    
+    export_date = datetime.now().isoformat()
+
+    if format_type == "Markdown":
+        # Prepend the fresh date so cache hits never carry a stale one
+        return (
+            f"# Visual Novel Script\n\n**Export Date:** {export_date}\n"
+            + generate_markdown_export(content)
+        )
+
     elif format_type == "CSV Summary":
-        return generate_csv_summary(export_data)
-    
-    else:
-        return json.dumps(export_data, indent=2)
+        return generate_csv_summary(content)
 
+    # "JSON" and any unknown format fall back to a JSON dump
+    export_data = {**content, 'export_date': export_date}
+    if orjson is not None:
+        return orjson.dumps(export_data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(export_data, indent=2)
+
+
+def _md_lines(data: Dict[str, Any]) -> Iterator[str]:
+    """Yield the Markdown export body line by line.
+
+    The title and export date header are added by export_script_format,
+    so the body stays cacheable across calls.
 
-def generate_markdown_export(data: Dict[str, Any]) -> str:
-    """Generate a Markdown format export of the visual novel script.
-    
     Args:
         data: Dictionary containing all script data
-        
-    Returns:
-        Markdown formatted string
+
+    Yields:
+        Individual Markdown lines
     """
-    md_content = []
-    
-    # Title and concept
-    md_content.append("# Visual Novel Script")
-    md_content.append(f"\n**Export Date:** {data['export_date']}")
-    md_content.append("\n## Story Concept")
-    md_content.append(f"\n{data['story_concept']}")
-    
+    # Concept
+    yield "\n## Story Concept"
+    yield f"\n{data['story_concept']}"
+
     # Characters
     if data['characters']:
-        md_content.append("\n## Characters")
+        yield "\n## Characters"
         for char in data['characters']:
-            md_content.append(f"\n### {char['name']} ({char['role']})")
-            md_content.append(f"- **Age:** {char['age']}")
-            md_content.append(f"- **Personality:** {char['personality']}")
-            md_content.append(f"- **Background:** {char['background']}")
-            md_content.append(f"- **Goals:** {char['goals']}")
-    
+            yield f"\n### {char['name']} ({char['role']})"
+            yield f"- **Age:** {char['age']}"
+            yield f"- **Personality:** {char['personality']}"
+            yield f"- **Background:** {char['background']}"
+            yield f"- **Goals:** {char['goals']}"
+
     # Story Arcs
     if data['story_arcs']:
-        md_content.append("\n## Story Arcs")
+        yield "\n## Story Arcs"
         for arc in data['story_arcs']:
-            md_content.append(f"\n### {arc['name']}")
-            md_content.append(f"**Chapters:** {arc['start_chapter']} - {arc['end_chapter']}")
-            md_content.append(f"**Description:** {arc['description']}")
-            md_content.append(f"**Themes:** {arc['themes']}")
+            yield f"\n### {arc['name']}"
+            yield f"**Chapters:** {arc['start_chapter']} - {arc['end_chapter']}"
+            yield f"**Description:** {arc['description']}"
+            yield f"**Themes:** {arc['themes']}"
             if arc['characters']:
-                md_content.append(f"**Characters:** {', '.join(arc['characters'])}")
-    
-    # Milestones
+                yield f"**Characters:** {', '.join(arc['characters'])}"
+
+    # Milestones (the app maintains these sorted by chapter at insert time)
     if data['milestones']:
-        md_content.append("\n## Story Milestones")
-        sorted_milestones = sorted(data['milestones'], key=lambda x: x['chapter'])
-        for milestone in sorted_milestones:
-            md_content.append(f"\n### Chapter {milestone['chapter']}: {milestone['name']}")
-            md_content.append(f"**Type:** {milestone['type']}")
-            md_content.append(f"**Impact:** {milestone['impact']}")
-            md_content.append(f"**Description:** {milestone['description']}")
+        yield "\n## Story Milestones"
+        for milestone in data['milestones']:
+            yield f"\n### Chapter {milestone['chapter']}: {milestone['name']}"
+            yield f"**Type:** {milestone['type']}"
+            yield f"**Impact:** {milestone['impact']}"
+            yield f"**Description:** {milestone['description']}"
             if milestone['related_arc']:
-                md_content.append(f"**Related Arc:** {milestone['related_arc']}")
-    
+                yield f"**Related Arc:** {milestone['related_arc']}"
+
     # Dialogue Scenes
     if data['dialogue_scenes']:
-        md_content.append("\n## Dialogue Scenes")
+        yield "\n## Dialogue Scenes"
         for scene in data['dialogue_scenes']:
-            md_content.append(f"\n### {scene['name']} (Chapter {scene['chapter']})")
-            md_content.append(f"**Characters:** {', '.join(scene['characters'])}")
-            md_content.append(f"**Dialogue:** {scene['dialogue']}")
+            yield f"\n### {scene['name']} (Chapter {scene['chapter']})"
+            yield f"**Characters:** {', '.join(scene['characters'])}"
+            yield f"**Dialogue:** {scene['dialogue']}"
             if scene['branches']:
-                md_content.append("**Response Options:**")
+                yield "**Response Options:**"
                 for i, branch in enumerate(scene['branches'], 1):
-                    md_content.append(f"{i}. {branch}")
-    
-    return "\n".join(md_content)
+                    yield f"{i}. {branch}"
 
 
+@st.cache_data(max_entries=16, hash_funcs=_EXPORT_HASH_FUNCS)
+def generate_markdown_export(data: Dict[str, Any]) -> str:
+    """Generate the Markdown body of the visual novel script export.
+
+    Args:
+        data: Dictionary containing all script data
+
+    Returns:
+        Markdown formatted string, without the title and date header
+    """
+    return "\n".join(_md_lines(data))
+
+
+def summarize_project(
+    characters: List[Character],
+    story_arcs: List[StoryArc],
+    milestones: List[Milestone],
+    dialogue_scenes: List[Dict[str, Any]]
+) -> Dict[str, int]:
+    """Compute summary counts for the whole project in one pass.
+
+    Args:
+        characters: List of character records
+        story_arcs: List of story arc records
+        milestones: List of milestone records
+        dialogue_scenes: List of dialogue scene dictionaries
+
+    Returns:
+        Dictionary of summary counts
+    """
+    total_characters = main_characters = supporting_characters = 0
+    for char in characters:
+        if getattr(char, 'deleted', False):
+            continue
+        total_characters += 1
+        role = char['role']
+        if role == 'Main Character':
+            main_characters += 1
+        elif role != 'Love Interest':
+            supporting_characters += 1
+
+    return {
+        'characters': total_characters,
+        'story_arcs': len(story_arcs),
+        'milestones': len(milestones),
+        'dialogue_scenes': len(dialogue_scenes),
+        'estimated_chapters': max(m['chapter'] for m in milestones) if milestones else 0,
+        'main_characters': main_characters,
+        'supporting_characters': supporting_characters
+    }
+
+
+@st.cache_data(max_entries=16, hash_funcs=_EXPORT_HASH_FUNCS)
 def generate_csv_summary(data: Dict[str, Any]) -> str:
     """Generate a CSV summary of the visual novel script.
-    
+
     Args:
         data: Dictionary containing all script data
-        
+
     Returns:
         CSV formatted string
     """
-    # Create summary statistics
-    summary_data = {
-        'Metric': [
-            'Total Characters',
-            'Total Story Arcs',
-            'Total Milestones',
-            'Total Dialogue Scenes',
-            'Estimated Chapters',
-            'Main Characters',
-            'Supporting Characters'
-        ],
-        'Count': [
-            len(data['characters']),
-            len(data['story_arcs']),
-            len(data['milestones']),
-            len(data['dialogue_scenes']),
-            max([m['chapter'] for m in data['milestones']] + [0]) if data['milestones'] else 0,
-            len([c for c in data['characters'] if c['role'] == 'Main Character']),
-            len([c for c in data['characters'] if c['role'] not in ['Main Character', 'Love Interest']])
-        ]
-    }
-    
-    df = pd.DataFrame(summary_data)
-    return df.to_csv(index=False)
+    summary = summarize_project(
+        data['characters'], data['story_arcs'],
+        data['milestones'], data['dialogue_scenes']
+    )
+
+    # Write the summary rows directly, no DataFrame intermediary needed
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(['Metric', 'Count'])
+    writer.writerows([
+        ('Total Characters', summary['characters']),
+        ('Total Story Arcs', summary['story_arcs']),
+        ('Total Milestones', summary['milestones']),
+        ('Total Dialogue Scenes', summary['dialogue_scenes']),
+        ('Estimated Chapters', summary['estimated_chapters']),
+        ('Main Characters', summary['main_characters']),
+        ('Supporting Characters', summary['supporting_characters'])
+    ])
+    return buffer.getvalue()
 
 
 def analyze_story_structure(
-    characters: List[Dict[str, Any]],
-    story_arcs: List[Dict[str, Any]],
-    milestones: List[Dict[str, Any]]
+    characters: List[Character],
+    story_arcs: List[StoryArc],
+    milestones: List[Milestone]
 ) -> Dict[str, Any]:
     """Analyze the story structure and provide insights.
-    
+
     Args:
-        characters: List of character dictionaries
-        story_arcs: List of story arc dictionaries
-        milestones: List of milestone dictionaries
-        
+        characters: List of character records
+        story_arcs: List of story arc records
+        milestones: List of milestone records
+
     Returns:
         Dictionary containing analysis results
     """
+    live_characters = [c for c in characters if not getattr(c, 'deleted', False)]
+
     analysis = {
-        'character_count': len(characters),
+        'character_count': len(live_characters),
         'arc_count': len(story_arcs),
         'milestone_count': len(milestones),
         'estimated_length': 0,
-        'character_roles': {},
+        'character_roles': dict(Counter(char['role'] for char in live_characters)),
         'pacing_analysis': []
     }
-    
-    # Character role distribution
-    for char in characters:
-        role = char['role']
-        analysis['character_roles'][role] = analysis['character_roles'].get(role, 0) + 1
-    
-    # Estimate story length
+
+    # Estimate story length and analyze pacing from one sorted chapter array
     if milestones:
-        analysis['estimated_length'] = max(m['chapter'] for m in milestones)
+        chapters = np.sort(np.fromiter(
+            (m['chapter'] for m in milestones),
+            dtype=np.int64,
+            count=len(milestones)
+        ))
+        analysis['estimated_length'] = int(chapters[-1])
+
+        gaps = np.diff(chapters)
+        for i in np.flatnonzero(gaps > 3).tolist():
+            analysis['pacing_analysis'].append(
+                f"Large gap between chapters {int(chapters[i])} and {int(chapters[i + 1])}"
+            )
     elif story_arcs:
         analysis['estimated_length'] = max(arc['end_chapter'] for arc in story_arcs)
-    
-    # Basic pacing analysis
-    if milestones:
-        milestone_chapters = [m['chapter'] for m in milestones]
-        milestone_chapters.sort()
-        
-        for i in range(len(milestone_chapters) - 1):
-            gap = milestone_chapters[i + 1] - milestone_chapters[i]
-            if gap > 3:
-                analysis['pacing_analysis'].append(f"Large gap between chapters {milestone_chapters[i]} and {milestone_chapters[i + 1]}")
-    
+
     return analysis
 
 
 def validate_story_structure(
-    characters: List[Dict[str, Any]],
-    story_arcs: List[Dict[str, Any]],
-    milestones: List[Dict[str, Any]]
+    characters: List[Character],
+    story_arcs: List[StoryArc],
+    milestones: List[Milestone]
 ) -> List[str]:
     """Validate the story structure and return warnings/suggestions.
-    
+
     Args:
-        characters: List of character dictionaries
-        story_arcs: List of story arc dictionaries
-        milestones: List of milestone dictionaries
-        
+        characters: List of character records
+        story_arcs: List of story arc records
+        milestones: List of milestone records
+
     Returns:
         List of validation messages
     """
     warnings = []
     
-    # Check for main character
-    main_chars = [c for c in characters if c['role'] == 'Main Character']
+    # Check for main character, skipping tombstoned records
+    main_chars = [
+        c for c in characters
+        if not getattr(c, 'deleted', False) and c['role'] == 'Main Character'
+    ]
     if len(main_chars) == 0:
         warnings.append("Consider adding a Main Character to your story.")
     elif len(main_chars) > 3:
         warnings.append("You have many Main Characters - consider if some should be Supporting characters.")
     
-    # Check story arc coverage
+    # Check story arc coverage by merging chapter intervals rather than
+    # materializing a set of every covered chapter number
     if story_arcs:
-        total_chapters = max(arc['end_chapter'] for arc in story_arcs) if story_arcs else 0
-        covered_chapters = set()
-        for arc in story_arcs:
-            covered_chapters.update(range(arc['start_chapter'], arc['end_chapter'] + 1))
-        
-        if len(covered_chapters) < total_chapters:
+        total_chapters = max(arc['end_chapter'] for arc in story_arcs)
+        intervals = sorted(
+            (arc['start_chapter'], arc['end_chapter']) for arc in story_arcs
+        )
+        covered = 0
+        current_start, current_end = intervals[0]
+        for start, end in intervals[1:]:
+            if start <= current_end + 1:
+                current_end = max(current_end, end)
+            else:
+                covered += current_end - current_start + 1
+                current_start, current_end = start, end
+        covered += current_end - current_start + 1
+
+        if covered < total_chapters:
             warnings.append("Some chapters may not be covered by any story arc.")
     
     # Check milestone distribution
@@ -7,4 +7,4 @@ import pandas as pd
 @pytest.fixture
 def sample_dataframe():
     """Fixture providing a sample dataframe for testing."""
-    return pd.DataFrame({"A": [1, 2, 3], "B": [4, 5, 6]})
+    return pd.DataFrame({"value_a": [1.0, 2.0, 3.0], "value_b": [4.0, 5.0, 6.0]})
@@ -2,19 +2,74 @@
 
 import pandas as pd
 
-from streamlit_template.utils import get_data, process_data
+from streamlit_template.utils import (
+    create_character,
+    create_story_arc,
+    export_script_format,
+    get_sample_data,
+    process_data,
+    validate_story_structure,
+)
 
 
-def test_get_data():
-    """Test that get_data returns a properly structured dataframe."""
-    data = get_data()
+def test_get_sample_data():
+    """Test that get_sample_data returns a properly structured dataframe."""
+    data = get_sample_data(rows=5)
     assert isinstance(data, pd.DataFrame)
-    assert data.shape[1] == 2
-    assert all(col in data.columns for col in ["A", "B"])
+    assert len(data) == 5
+    assert all(col in data.columns for col in ["date", "value_a", "value_b", "category"])
 
 
 def test_process_data(sample_dataframe):
     """Test that process_data correctly adds computed columns."""
     result = process_data(sample_dataframe)
-    assert "C" in result.columns
-    assert all(result["C"] == sample_dataframe["A"] + sample_dataframe["B"])
+    assert all(col in result.columns for col in ["sum", "mean", "abs_diff"])
+    assert all(result["sum"] == sample_dataframe["value_a"] + sample_dataframe["value_b"])
+    assert all(result["mean"] == result["sum"] / 2)
+    assert all(result["abs_diff"] == abs(sample_dataframe["value_a"] - sample_dataframe["value_b"]))
+
+
+def test_create_character_record():
+    """Test that character records support dict-style access."""
+    character = create_character("Hero", "Main Character", 18, "brave", "farm", "win")
+    assert character["name"] == "Hero"
+    assert character["role"] == "Main Character"
+    assert character["id"]
+    assert character["created_at"]
+
+
+def test_csv_summary_export():
+    """Test that the CSV summary export counts characters by role."""
+    characters = [
+        create_character("Hero", "Main Character", 18, "", "", ""),
+        create_character("Pal", "Friend", 17, "", "", ""),
+    ]
+    result = export_script_format("", characters, [], [], [], "CSV Summary")
+    lines = result.splitlines()
+    assert lines[0] == "Metric,Count"
+    assert "Total Characters,2" in lines
+    assert "Main Characters,1" in lines
+    assert "Supporting Characters,1" in lines
+
+
+def test_process_data_leaves_input_unmodified(sample_dataframe):
+    """Test that process_data does not mutate the input dataframe."""
+    process_data(sample_dataframe)
+    assert "sum" not in sample_dataframe.columns
+
+
+def test_validate_story_structure_arc_coverage():
+    """Test that uncovered chapters between arcs produce a warning."""
+    gap_arcs = [
+        create_story_arc("Opening", "", 1, 3, "", []),
+        create_story_arc("Finale", "", 6, 8, "", []),
+    ]
+    warnings = validate_story_structure([], gap_arcs, [])
+    assert "Some chapters may not be covered by any story arc." in warnings
+
+    full_arcs = [
+        create_story_arc("Opening", "", 1, 4, "", []),
+        create_story_arc("Finale", "", 5, 8, "", []),
+    ]
+    warnings = validate_story_structure([], full_arcs, [])
+    assert "Some chapters may not be covered by any story arc." not in warnings